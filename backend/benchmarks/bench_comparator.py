@@ -0,0 +1,58 @@
+"""Micro-benchmarks for comparator.compare_outputs on large outputs.
+
+Run from backend/:  python -m benchmarks.bench_comparator
+"""
+import random
+import time
+import tracemalloc
+
+from comparator import (
+    compare_outputs, EXACT, WHITESPACE_INSENSITIVE, LINE_ORDER_INSENSITIVE, NUMERIC_TOLERANCE
+)
+
+LINES = 200_000  # roughly 5 MB of output
+
+
+def make_output(seed=0):
+    rng = random.Random(seed)
+    return "".join(f"{i} {rng.random():.9f} {rng.randint(0, 10**6)}\n" for i in range(LINES))
+
+
+def bench(name, expected, actual, mode):
+    # actual may be a factory so iterators get a fresh copy per run
+    fresh = actual if callable(actual) else lambda: actual
+
+    start = time.perf_counter()
+    result = compare_outputs(expected, fresh(), mode=mode)
+    elapsed = time.perf_counter() - start
+
+    # Separate run for memory, tracemalloc slows everything down. Build the input
+    # first so only the comparator's own allocations are traced.
+    source = fresh()
+    tracemalloc.start()
+    compare_outputs(expected, source, mode=mode)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<32} {mode:<11} {elapsed * 1000:9.1f} ms  peak {peak / 2**20:7.2f} MiB  match={result.matches}")
+
+
+def main():
+    expected = make_output()
+    print(f"output size: {len(expected) / 2**20:.1f} MiB, {LINES} lines")
+
+    early = "0 x\n" + expected
+    late = expected[:-2] + "9\n"
+    shuffled = expected.splitlines(keepends=True)
+    random.Random(1).shuffle(shuffled)
+    shuffled = "".join(shuffled)
+
+    for mode in (EXACT, WHITESPACE_INSENSITIVE, NUMERIC_TOLERANCE):
+        bench("identical", expected, expected, mode)
+        bench("identical, streamed lines", expected, lambda: iter(expected.splitlines()), mode)
+        bench("mismatch on first line", expected, early, mode)
+        bench("mismatch on last line", expected, late, mode)
+    bench("shuffled", expected, shuffled, LINE_ORDER_INSENSITIVE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import math
+from collections import Counter
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+EXACT = "exact"
+WHITESPACE_INSENSITIVE = "whitespace"
+LINE_ORDER_INSENSITIVE = "line_order"
+NUMERIC_TOLERANCE = "numeric"
+
+COMPARISON_MODES = (EXACT, WHITESPACE_INSENSITIVE, LINE_ORDER_INSENSITIVE, NUMERIC_TOLERANCE)
+DEFAULT_TOLERANCE = 1e-6
+
+# Either a whole string or anything yielding lines (an open text file, a generator...)
+Output = Union[str, Iterable[str]]
+
+
+@dataclass
+class ComparisonResult:
+    matches: bool
+    line: Optional[int] = None    # 1-based position of the first difference in the actual output
+    column: Optional[int] = None
+    expected: Optional[str] = None
+    actual: Optional[str] = None
+
+
+def _str_lines(output: str) -> Iterator[str]:
+    # Slice lines out of the string instead of wrapping it in StringIO, which copies it
+    start = 0
+    end = len(output)
+    while start < end:
+        newline = output.find("\n", start)
+        if newline == -1:
+            yield output[start:]
+            return
+        yield output[start:newline]
+        start = newline + 1
+
+
+def _lines(output: Output) -> Iterator[str]:
+    lines = _str_lines(output) if isinstance(output, str) else output
+    for line in lines:
+        yield line.rstrip("\r\n")
+
+
+def _tokens(output: Output) -> Iterator[Tuple[str, int, int, str]]:
+    # (token, line number, index of the token within its line, line)
+    for line_no, line in enumerate(_lines(output), start=1):
+        for index, token in enumerate(line.split()):
+            yield token, line_no, index, line
+
+
+def _token_column(line: str, index: int) -> int:
+    column = 0
+    for token in line.split()[:index + 1]:
+        column = line.index(token, column) + len(token)
+    return column - len(token) + 1
+
+
+def _first_diff_column(expected: str, actual: str) -> int:
+    for i, (e, a) in enumerate(zip(expected, actual)):
+        if e != a:
+            return i + 1
+    return min(len(expected), len(actual)) + 1
+
+
+def _compare_exact(expected: Output, actual: Output) -> ComparisonResult:
+    line_no = 0
+    for line_no, (e, a) in enumerate(zip_longest(_lines(expected), _lines(actual)), start=1):
+        if e != a:
+            if e is None or a is None:
+                return ComparisonResult(False, line_no, 1, e, a)
+            return ComparisonResult(False, line_no, _first_diff_column(e, a), e, a)
+    return ComparisonResult(True)
+
+
+def _numbers_close(e: str, a: str, tolerance: float) -> bool:
+    try:
+        return math.isclose(float(e), float(a), rel_tol=tolerance, abs_tol=tolerance)
+    except ValueError:
+        return False
+
+
+def _compare_tokens(expected: Output, actual: Output, tolerance: Optional[float]) -> ComparisonResult:
+    last = None
+    for e, a in zip_longest(_tokens(expected), _tokens(actual)):
+        if e is None:
+            return ComparisonResult(False, a[1], _token_column(a[3], a[2]), None, a[0])
+        if a is None:
+            # Actual output ended early; point just past its last token
+            if last is None:
+                return ComparisonResult(False, 1, 1, e[0], None)
+            column = _token_column(last[3], last[2]) + len(last[0])
+            return ComparisonResult(False, last[1], column, e[0], None)
+        last = a
+        if e[0] == a[0]:
+            continue
+        if tolerance is not None and _numbers_close(e[0], a[0], tolerance):
+            continue
+        return ComparisonResult(False, a[1], _token_column(a[3], a[2]), e[0], a[0])
+    return ComparisonResult(True)
+
+
+def _compare_line_order(expected: Output, actual: Output) -> ComparisonResult:
+    remaining = Counter(_lines(expected))
+    line_no = 0
+    for line_no, line in enumerate(_lines(actual), start=1):
+        if remaining[line] <= 0:
+            return ComparisonResult(False, line_no, 1, None, line)
+        remaining[line] -= 1
+    missing = next((line for line, count in remaining.items() if count > 0), None)
+    if missing is not None:
+        return ComparisonResult(False, line_no + 1, 1, missing, None)
+    return ComparisonResult(True)
+
+
+def compare_outputs(
+    expected: Output,
+    actual: Output,
+    mode: str = EXACT,
+    tolerance: Optional[float] = None,
+) -> ComparisonResult:
+    """Compare program output with the expected output, stopping at the first mismatch.
+
+    Both sides are consumed line by line, so file objects can be passed directly
+    without reading them into memory. Line-order-insensitive mode has to hold the
+    expected lines in a counter; the other modes keep only the current line.
+    """
+    if mode == EXACT:
+        if isinstance(expected, str) and isinstance(actual, str) and expected == actual:
+            return ComparisonResult(True)
+        return _compare_exact(expected, actual)
+    if mode == WHITESPACE_INSENSITIVE:
+        return _compare_tokens(expected, actual, None)
+    if mode == NUMERIC_TOLERANCE:
+        return _compare_tokens(expected, actual, DEFAULT_TOLERANCE if tolerance is None else tolerance)
+    if mode == LINE_ORDER_INSENSITIVE:
+        return _compare_line_order(expected, actual)
+    raise ValueError(f"Unknown comparison mode: {mode}")
+
+
+def compare_question_output(question, actual: Output) -> ComparisonResult:
+    """Compare runner output against a coding question's stored expected output."""
+    return compare_outputs(
+        question.correct_answer or "",
+        actual,
+        mode=question.comparison_mode or EXACT,
+        tolerance=question.comparison_tolerance,
+    )
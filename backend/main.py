@@ -1,16 +1,38 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import logging
+import os
 import uvicorn
 
-from database import create_tables, engine
+from database import engine
+from startup import check_schema_version, warm_up, WARMUP_ON_STARTUP
 from routes import auth, tests
 
+logger = logging.getLogger(__name__)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create tables on startup
-    await create_tables()
+    # Schema is owned by Alembic; refuse to start against an outdated database
+    await check_schema_version()
+    os.makedirs(tests.UPLOAD_DIR, exist_ok=True)
+
+    app.state.ready = not WARMUP_ON_STARTUP
+    warmup_task = None
+    if WARMUP_ON_STARTUP:
+        async def run_warm_up():
+            try:
+                await warm_up()
+            except Exception:
+                # Warm-up only saves latency; serve cold rather than never becoming ready
+                logger.exception("Startup warm-up failed, continuing without it")
+            app.state.ready = True
+        warmup_task = asyncio.create_task(run_warm_up())
     yield
+    if warmup_task is not None:
+        warmup_task.cancel()
     # Clean up on shutdown
     await engine.dispose()
 
@@ -38,5 +60,11 @@ app.include_router(tests.router, prefix="/api", tags=["Tests"])
 async def root():
     return {"message": "Exam System API is running"}
 
+@app.get("/ready")
+async def ready():
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"ready": False})
+    return {"ready": True}
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=os.getenv("RELOAD", "false").lower() == "true")
\ No newline at end of file
@@ -0,0 +1,61 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.engine import Connection
+
+from database import engine, Base
+import models  # noqa: F401  (registers tables on Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Search index objects from migration 0004 live outside the ORM models;
+# hide them from autogenerate so it doesn't try to drop them.
+SEARCH_INDEX_TABLE = "questions_fts"  # plus FTS5 shadow tables questions_fts_*
+SEARCH_INDEX_COLUMNS = {("questions", "search_vector")}
+SEARCH_INDEX_INDEXES = {"ix_questions_search_vector"}
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return name != SEARCH_INDEX_TABLE and not name.startswith(SEARCH_INDEX_TABLE + "_")
+    if type_ == "column":
+        return (parent_names.get("table_name"), name) not in SEARCH_INDEX_COLUMNS
+    if type_ == "index":
+        return name not in SEARCH_INDEX_INDEXES
+    return True
+
+
+def run_migrations_offline():
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        include_name=include_name,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection):
+    context.configure(connection=connection, target_metadata=target_metadata, include_name=include_name)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online():
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
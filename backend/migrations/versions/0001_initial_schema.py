@@ -0,0 +1,115 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=True),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("role", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "subjects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_subjects_id", "subjects", ["id"])
+    op.create_index("ix_subjects_name", "subjects", ["name"], unique=True)
+
+    op.create_table(
+        "tests",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("subject_id", sa.Integer(), sa.ForeignKey("subjects.id"), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("total_marks", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_tests_id", "tests", ["id"])
+    op.create_index("ix_tests_title", "tests", ["title"])
+
+    op.create_table(
+        "questions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("test_id", sa.Integer(), sa.ForeignKey("tests.id"), nullable=True),
+        sa.Column("question_type", sa.String(), nullable=True),
+        sa.Column("question_text", sa.Text(), nullable=True),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column("correct_answer", sa.String(), nullable=True),
+        sa.Column("marks", sa.Integer(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_questions_id", "questions", ["id"])
+
+    op.create_table(
+        "test_submissions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("test_id", sa.Integer(), sa.ForeignKey("tests.id"), nullable=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("time_taken_minutes", sa.Integer(), nullable=True),
+        sa.Column("total_marks_obtained", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_test_submissions_id", "test_submissions", ["id"])
+
+    op.create_table(
+        "submission_answers",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("submission_id", sa.Integer(), sa.ForeignKey("test_submissions.id"), nullable=True),
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=True),
+        sa.Column("answer", sa.Text(), nullable=True),
+        sa.Column("marks_obtained", sa.Integer(), nullable=True),
+        sa.Column("is_correct", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_submission_answers_id", "submission_answers", ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_submission_answers_id", table_name="submission_answers")
+    op.drop_table("submission_answers")
+    op.drop_index("ix_test_submissions_id", table_name="test_submissions")
+    op.drop_table("test_submissions")
+    op.drop_index("ix_questions_id", table_name="questions")
+    op.drop_table("questions")
+    op.drop_index("ix_tests_title", table_name="tests")
+    op.drop_index("ix_tests_id", table_name="tests")
+    op.drop_table("tests")
+    op.drop_index("ix_subjects_name", table_name="subjects")
+    op.drop_index("ix_subjects_id", table_name="subjects")
+    op.drop_table("subjects")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,25 @@
+"""question output comparison settings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("questions", sa.Column("comparison_mode", sa.String(), server_default="exact", nullable=True))
+    op.add_column("questions", sa.Column("comparison_tolerance", sa.Float(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("questions", "comparison_tolerance")
+    op.drop_column("questions", "comparison_mode")
@@ -0,0 +1,45 @@
+"""answer similarity signatures and LSH buckets
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "answer_signatures",
+        sa.Column("submission_answer_id", sa.Integer(), sa.ForeignKey("submission_answers.id"), nullable=False),
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=True),
+        sa.Column("language", sa.String(), nullable=True),
+        sa.Column("signature", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("submission_answer_id"),
+    )
+    op.create_index("ix_answer_signatures_question_id", "answer_signatures", ["question_id"])
+
+    op.create_table(
+        "answer_lsh_buckets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=True),
+        sa.Column("band", sa.Integer(), nullable=True),
+        sa.Column("bucket", sa.BigInteger(), nullable=True),
+        sa.Column("submission_answer_id", sa.Integer(), sa.ForeignKey("submission_answers.id"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_answer_lsh_buckets_lookup", "answer_lsh_buckets", ["question_id", "band", "bucket"])
+
+
+def downgrade():
+    op.drop_index("ix_answer_lsh_buckets_lookup", table_name="answer_lsh_buckets")
+    op.drop_table("answer_lsh_buckets")
+    op.drop_index("ix_answer_signatures_question_id", table_name="answer_signatures")
+    op.drop_table("answer_signatures")
@@ -0,0 +1,64 @@
+"""full-text search index over question text
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Generated column: PostgreSQL keeps it in sync on every insert/update
+        op.execute(
+            "ALTER TABLE questions ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('english', coalesce(question_text, ''))) STORED"
+        )
+        op.execute("CREATE INDEX ix_questions_search_vector ON questions USING GIN (search_vector)")
+    elif dialect == "sqlite":
+        # External-content FTS5 table, kept in sync by triggers. Porter stemming
+        # matches what the 'english' config does on PostgreSQL.
+        op.execute(
+            "CREATE VIRTUAL TABLE questions_fts USING fts5("
+            "question_text, content='questions', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER questions_fts_ai AFTER INSERT ON questions BEGIN "
+            "INSERT INTO questions_fts(rowid, question_text) VALUES (new.id, new.question_text); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER questions_fts_ad AFTER DELETE ON questions BEGIN "
+            "INSERT INTO questions_fts(questions_fts, rowid, question_text) "
+            "VALUES ('delete', old.id, old.question_text); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER questions_fts_au AFTER UPDATE OF question_text ON questions BEGIN "
+            "INSERT INTO questions_fts(questions_fts, rowid, question_text) "
+            "VALUES ('delete', old.id, old.question_text); "
+            "INSERT INTO questions_fts(rowid, question_text) VALUES (new.id, new.question_text); "
+            "END"
+        )
+        op.execute("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX ix_questions_search_vector")
+        op.execute("ALTER TABLE questions DROP COLUMN search_vector")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER questions_fts_au")
+        op.execute("DROP TRIGGER questions_fts_ad")
+        op.execute("DROP TRIGGER questions_fts_ai")
+        op.execute("DROP TABLE questions_fts")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, BigInteger, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -62,6 +62,9 @@ class Question(Base):
     correct_answer = Column(String, nullable=True)
     marks = Column(Integer)
     order_index = Column(Integer)
+    # Coding questions: how runner output is checked against correct_answer (see comparator.py)
+    comparison_mode = Column(String, default="exact", server_default="exact")
+    comparison_tolerance = Column(Float, nullable=True)
     
     test = relationship("Test", back_populates="questions")
 
@@ -94,3 +97,28 @@ class SubmissionAnswer(Base):
     
     submission = relationship("TestSubmission", back_populates="answers")
     question = relationship("Question")
+
+
+class AnswerSignature(Base):
+    __tablename__ = "answer_signatures"
+
+    # MinHash signature of a coding answer, see similarity.py
+    submission_answer_id = Column(Integer, ForeignKey("submission_answers.id"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), index=True)
+    language = Column(String, nullable=True)
+    signature = Column(JSON)
+
+
+class AnswerBucket(Base):
+    __tablename__ = "answer_lsh_buckets"
+
+    # One row per LSH band; answers sharing a bucket are candidate copies
+    id = Column(Integer, primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id"))
+    band = Column(Integer)
+    bucket = Column(BigInteger)
+    submission_answer_id = Column(Integer, ForeignKey("submission_answers.id"))
+
+    __table_args__ = (
+        Index("ix_answer_lsh_buckets_lookup", "question_id", "band", "bucket"),
+    )
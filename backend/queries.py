@@ -0,0 +1,15 @@
+from sqlalchemy.future import select
+
+from models import Test, Question
+
+# Statements shared by the routes and the startup warm-up. Keeping them in one place
+# means warm-up produces the exact SQL text the routes send, so asyncpg's per-connection
+# prepared-statement cache is actually reused.
+
+
+def active_test_query(test_id: int):
+    return select(Test).where(Test.id == test_id, Test.is_active == True)
+
+
+def test_questions_query(test_id: int):
+    return select(Question).where(Question.test_id == test_id).order_by(Question.order_index)
@@ -1,23 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List
+from typing import List, Optional
+import asyncio
 import shutil
-import os
-from sqlalchemy.orm import selectinload
+import csv
+import io
+import json
+from sqlalchemy.orm import selectinload, aliased
 
-from database import get_db
-from models import Test, Subject, Question, User, TestSubmission, SubmissionAnswer
+from database import get_db, AsyncSessionLocal
+from models import (
+    Test, Subject, Question, User, TestSubmission, SubmissionAnswer, AnswerSignature, AnswerBucket
+)
 from schemas import (
     TestCreate, Test as TestSchema, TestSubmissionCreate, TestSubmission as TestSubmissionSchema,
-    Subject as SubjectSchema
+    Subject as SubjectSchema, SimilarAnswerPair, Question as QuestionSchema,
+    QuestionSearchHit, QuestionSearchPage
 )
 from auth import get_current_user
+from queries import active_test_query, test_questions_query
+from comparator import compare_question_output
+from runner import run_code, RunnerUnavailable
+from search import search_questions
+from similarity import signature_for, band_hashes, estimate_similarity, DEFAULT_THRESHOLD
 
 router = APIRouter()
 
 UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.get("/subjects/")
 async def get_subjects(db: AsyncSession = Depends(get_db)):
@@ -35,17 +46,13 @@ async def get_tests_by_subject(subject_id: int, db: AsyncSession = Depends(get_d
 
 @router.get("/tests/{test_id}", response_model=TestSchema)
 async def get_test(test_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Test).where(Test.id == test_id, Test.is_active == True)
-    )
+    result = await db.execute(active_test_query(test_id))
     test = result.scalar_one_or_none()
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
     
     # Load questions
-    result = await db.execute(
-        select(Question).where(Question.test_id == test_id).order_by(Question.order_index)
-    )
+    result = await db.execute(test_questions_query(test_id))
     test.questions = result.scalars().all()
     
     return test
@@ -78,7 +85,9 @@ async def create_test(
             options=q.options,
             correct_answer=q.correct_answer,
             marks=q.marks,
-            order_index=q.order_index
+            order_index=q.order_index,
+            comparison_mode=q.comparison_mode or "exact",
+            comparison_tolerance=q.comparison_tolerance
         )
         db.add(db_question)
     
@@ -86,13 +95,49 @@ async def create_test(
     await db.refresh(db_test)
     
     # Load questions for response
-    result = await db.execute(
-        select(Question).where(Question.test_id == db_test.id).order_by(Question.order_index)
-    )
+    result = await db.execute(test_questions_query(db_test.id))
     db_test.questions = result.scalars().all()
     
     return db_test
 
+@router.get("/questions/search", response_model=QuestionSearchPage)
+async def search_question_bank(
+    q: str = Query(..., min_length=1),
+    subject_id: Optional[int] = None,
+    question_type: Optional[str] = None,
+    min_marks: Optional[int] = None,
+    max_marks: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "teacher":
+        raise HTTPException(status_code=403, detail="Only teachers can search the question bank")
+
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=422, detail="Search query must not be blank")
+
+    rows, has_more = await search_questions(
+        db, q,
+        subject_id=subject_id,
+        question_type=question_type,
+        min_marks=min_marks,
+        max_marks=max_marks,
+        limit=limit,
+        offset=offset
+    )
+    items = [
+        QuestionSearchHit(
+            **QuestionSchema.model_validate(question).model_dump(),
+            subject_id=question_subject_id,
+            rank=rank
+        )
+        for question, question_subject_id, rank in rows
+    ]
+    return QuestionSearchPage(items=items, limit=limit, offset=offset, has_more=has_more)
+
 @router.post("/tests/{test_id}/upload-pdf")
 async def upload_test_pdf(
     test_id: int,
@@ -132,6 +177,24 @@ async def submit_test(
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
 
+    result = await db.execute(
+        select(Question).where(Question.id.in_([answer.question_id for answer in submission.answers]))
+    )
+    questions = {question.id: question for question in result.scalars().all()}
+
+    # Release the connection before calling the runner, which can take seconds per answer;
+    # the write transaction is only opened once every coding answer has been graded.
+    await db.commit()
+    coding = {
+        index: answer
+        for index, answer in enumerate(submission.answers)
+        if answer.question_id in questions and questions[answer.question_id].question_type == "coding"
+    }
+    grades = await asyncio.gather(
+        *(grade_coding_answer(questions[answer.question_id], answer) for answer in coding.values())
+    )
+    coding_grades = dict(zip(coding, grades))
+
     # Create submission
     db_submission = TestSubmission(
         test_id=test_id,
@@ -143,11 +206,10 @@ async def submit_test(
 
     total_marks = 0
     answers_to_add = []
+    coding_answers = []  # (SubmissionAnswer, language) to index for similarity
 
-    for answer in submission.answers:
-        # Get question
-        result = await db.execute(select(Question).where(Question.id == answer.question_id))
-        question = result.scalar_one_or_none()
+    for index, answer in enumerate(submission.answers):
+        question = questions.get(answer.question_id)
 
         if question:
             is_correct = False
@@ -157,24 +219,28 @@ async def submit_test(
                 is_correct = answer.answer == question.correct_answer
                 marks_obtained = question.marks if is_correct else 0
             elif question.question_type == "coding":
-                # Simplified placeholder grading
-                is_correct = True
-                marks_obtained = question.marks
-
-            total_marks += marks_obtained
-
-            answers_to_add.append(
-                SubmissionAnswer(
-                    submission_id=db_submission.id,
-                    question_id=answer.question_id,
-                    answer=answer.answer,
-                    marks_obtained=marks_obtained,
-                    is_correct=is_correct,
-                )
+                is_correct, marks_obtained = coding_grades[index]
+
+            total_marks += marks_obtained or 0
+
+            db_answer = SubmissionAnswer(
+                submission_id=db_submission.id,
+                question_id=answer.question_id,
+                answer=answer.answer,
+                marks_obtained=marks_obtained,
+                is_correct=is_correct,
             )
+            answers_to_add.append(db_answer)
+            if question.question_type == "coding":
+                coding_answers.append((db_answer, answer.language))
 
     db.add_all(answers_to_add)
 
+    if coding_answers:
+        await db.flush()  # to get answer IDs
+        for db_answer, language in coding_answers:
+            index_answer(db, db_answer, language)
+
     db_submission.total_marks_obtained = total_marks
     await db.commit()
 
@@ -208,3 +274,207 @@ async def get_my_submissions(
 
     submissions = result.scalars().all()
     return submissions
+
+
+async def grade_coding_answer(question: Question, answer):
+    """Run a coding answer and check its stdout against the question's expected output."""
+    if not question.correct_answer:
+        # No expected output stored, nothing to compare against
+        return True, question.marks
+    try:
+        run = await run_code(answer.language or "python", answer.answer)
+    except RunnerUnavailable:
+        return None, None  # left ungraded for the teacher
+    if run.get("timed_out") or run.get("exit_code") != 0:
+        return False, 0
+    result = compare_question_output(question, run.get("stdout") or "")
+    return result.matches, question.marks if result.matches else 0
+
+
+def index_answer(db: AsyncSession, db_answer: SubmissionAnswer, language):
+    """Store the MinHash signature and LSH buckets of a coding answer."""
+    signature = signature_for(db_answer.answer or "", language)
+    if signature is None:
+        return
+    db.add(AnswerSignature(
+        submission_answer_id=db_answer.id,
+        question_id=db_answer.question_id,
+        language=language,
+        signature=signature
+    ))
+    db.add_all([
+        AnswerBucket(
+            question_id=db_answer.question_id,
+            band=band,
+            bucket=bucket,
+            submission_answer_id=db_answer.id
+        )
+        for band, bucket in enumerate(band_hashes(signature))
+    ])
+
+
+@router.get("/questions/{question_id}/similar-answers", response_model=List[SimilarAnswerPair])
+async def get_similar_answers(
+    question_id: int,
+    threshold: float = Query(DEFAULT_THRESHOLD, ge=0.0, le=1.0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "teacher":
+        raise HTTPException(status_code=403, detail="Only teachers can view similar answers")
+
+    result = await db.execute(
+        select(Question)
+        .join(Test, Test.id == Question.test_id)
+        .where(Question.id == question_id, Test.created_by == current_user.id)
+    )
+    if not result.scalar_one_or_none():
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    # Candidate pairs are answers sharing at least one LSH bucket, found via the index
+    a, b = aliased(AnswerBucket), aliased(AnswerBucket)
+    result = await db.execute(
+        select(a.submission_answer_id, b.submission_answer_id)
+        .join(b, (b.question_id == a.question_id) & (b.band == a.band) & (b.bucket == a.bucket))
+        .where(a.question_id == question_id, a.submission_answer_id < b.submission_answer_id)
+        .distinct()
+    )
+    candidates = result.all()
+    if not candidates:
+        return []
+
+    answer_ids = {answer_id for pair in candidates for answer_id in pair}
+    result = await db.execute(
+        select(
+            AnswerSignature.submission_answer_id,
+            AnswerSignature.signature,
+            TestSubmission.id,
+            TestSubmission.student_id,
+        )
+        .join(SubmissionAnswer, SubmissionAnswer.id == AnswerSignature.submission_answer_id)
+        .join(TestSubmission, TestSubmission.id == SubmissionAnswer.submission_id)
+        .where(AnswerSignature.submission_answer_id.in_(answer_ids))
+    )
+    info = {row[0]: row[1:] for row in result.all()}
+
+    pairs = []
+    for id_a, id_b in candidates:
+        sig_a, submission_a, student_a = info[id_a]
+        sig_b, submission_b, student_b = info[id_b]
+        if student_a == student_b:
+            continue
+        similarity = estimate_similarity(sig_a, sig_b)
+        if similarity >= threshold:
+            pairs.append(SimilarAnswerPair(
+                similarity=similarity,
+                answer_id_a=id_a,
+                submission_id_a=submission_a,
+                student_id_a=student_a,
+                answer_id_b=id_b,
+                submission_id_b=submission_b,
+                student_id_b=student_b,
+            ))
+
+    pairs.sort(key=lambda p: p.similarity, reverse=True)
+    return pairs
+
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    "submission_id", "student_id", "student_name", "student_email",
+    "submitted_at", "time_taken_minutes", "total_marks_obtained",
+    "question_id", "order_index", "question_type", "question_text",
+    "answer", "marks_obtained", "is_correct",
+]
+
+
+def _export_query(test_id: int):
+    # Plain columns rather than ORM entities so rows never enter the identity map
+    return (
+        select(
+            TestSubmission.id.label("submission_id"),
+            User.id.label("student_id"),
+            User.full_name.label("student_name"),
+            User.email.label("student_email"),
+            TestSubmission.submitted_at.label("submitted_at"),
+            TestSubmission.time_taken_minutes.label("time_taken_minutes"),
+            TestSubmission.total_marks_obtained.label("total_marks_obtained"),
+            SubmissionAnswer.question_id.label("question_id"),
+            Question.order_index.label("order_index"),
+            Question.question_type.label("question_type"),
+            Question.question_text.label("question_text"),
+            SubmissionAnswer.answer.label("answer"),
+            SubmissionAnswer.marks_obtained.label("marks_obtained"),
+            SubmissionAnswer.is_correct.label("is_correct"),
+        )
+        # Outer joins so submissions without answers (or answers to deleted questions) still export
+        .outerjoin(User, User.id == TestSubmission.student_id)
+        .outerjoin(SubmissionAnswer, SubmissionAnswer.submission_id == TestSubmission.id)
+        .outerjoin(Question, Question.id == SubmissionAnswer.question_id)
+        .where(TestSubmission.test_id == test_id)
+        .order_by(TestSubmission.id, Question.order_index, SubmissionAnswer.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_safe(value):
+    # Student text starting like a formula would be evaluated by spreadsheet apps
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def _stream_export(test_id: int, fmt: str):
+    # Own session: the request-scoped one may be closed before the body is sent
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(_export_query(test_id))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(EXPORT_COLUMNS)
+
+        async for partition in result.partitions():
+            for row in partition:
+                record = dict(row._mapping)
+                submitted_at = record["submitted_at"]
+                record["submitted_at"] = submitted_at.isoformat() if submitted_at else None
+                if fmt == "csv":
+                    writer.writerow([_csv_safe(record[name]) for name in EXPORT_COLUMNS])
+                else:
+                    buffer.write(json.dumps({name: record[name] for name in EXPORT_COLUMNS}))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        tail = buffer.getvalue()
+        if tail:
+            yield tail
+
+
+@router.get("/tests/{test_id}/export")
+async def export_test_submissions(
+    test_id: int,
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "teacher":
+        raise HTTPException(status_code=403, detail="Only teachers can export submissions")
+
+    result = await db.execute(select(Test).where(Test.id == test_id, Test.created_by == current_user.id))
+    test = result.scalar_one_or_none()
+    if not test:
+        raise HTTPException(status_code=404, detail="Test not found")
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"test_{test_id}_submissions.{format}"
+    return StreamingResponse(
+        _stream_export(test_id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
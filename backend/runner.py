@@ -0,0 +1,38 @@
+import asyncio
+import json
+import os
+import urllib.error
+import urllib.request
+
+# Code runner service (backend/runner-service), POST /run {language, code}
+RUNNER_URL = os.getenv("RUNNER_URL", "http://localhost:8001/run")
+RUNNER_TIMEOUT_SECONDS = int(os.getenv("RUNNER_TIMEOUT_SECONDS", "5"))
+
+
+class RunnerUnavailable(Exception):
+    pass
+
+
+def _post_run(language: str, code: str) -> dict:
+    body = json.dumps({
+        "language": language,
+        "code": code,
+        "timeout_seconds": RUNNER_TIMEOUT_SECONDS,
+    }).encode("utf-8")
+    request = urllib.request.Request(RUNNER_URL, data=body, headers={"Content-Type": "application/json"})
+    try:
+        # Allow for container start-up on top of the execution timeout
+        with urllib.request.urlopen(request, timeout=RUNNER_TIMEOUT_SECONDS + 10) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        if 400 <= e.code < 500:
+            # The runner rejected the code itself (e.g. unsupported language): a failed run
+            return {"stdout": "", "stderr": e.read().decode("utf-8", "replace"), "exit_code": None, "timed_out": False}
+        raise RunnerUnavailable(f"Runner returned HTTP {e.code}") from e
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise RunnerUnavailable(str(e)) from e
+
+
+async def run_code(language: str, code: str) -> dict:
+    """Run code through the runner service; returns stdout, stderr, exit_code and timed_out."""
+    return await asyncio.to_thread(_post_run, language, code)
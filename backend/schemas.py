@@ -1,7 +1,9 @@
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 
+from comparator import COMPARISON_MODES, EXACT
+
 class UserBase(BaseModel):
     email: EmailStr
     full_name: str
@@ -41,6 +43,8 @@ class QuestionBase(BaseModel):
     correct_answer: Optional[str] = None
     marks: int
     order_index: int
+    comparison_mode: Optional[Literal[COMPARISON_MODES]] = EXACT
+    comparison_tolerance: Optional[float] = Field(None, ge=0)
 
 class QuestionCreate(QuestionBase):
     pass
@@ -52,6 +56,16 @@ class Question(QuestionBase):
     class Config:
         from_attributes = True
 
+class QuestionSearchHit(Question):
+    subject_id: Optional[int] = None  # tests.subject_id is nullable
+    rank: float
+
+class QuestionSearchPage(BaseModel):
+    items: List[QuestionSearchHit]
+    limit: int
+    offset: int
+    has_more: bool
+
 class TestBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -76,9 +90,12 @@ class SubmissionAnswerBase(BaseModel):
     question_id: int
     answer: str
 
+class SubmissionAnswerCreate(SubmissionAnswerBase):
+    language: Optional[str] = None  # coding questions only
+
 class TestSubmissionCreate(BaseModel):
     test_id: int
-    answers: List[SubmissionAnswerBase]
+    answers: List[SubmissionAnswerCreate]
     time_taken_minutes: int
 
 class SubmissionAnswer(SubmissionAnswerBase):
@@ -99,4 +116,13 @@ class TestSubmission(BaseModel):
     answers: List[SubmissionAnswer] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SimilarAnswerPair(BaseModel):
+    similarity: float
+    answer_id_a: int
+    submission_id_a: int
+    student_id_a: int
+    answer_id_b: int
+    submission_id_b: int
+    student_id_b: int
@@ -0,0 +1,64 @@
+from typing import Optional
+
+from sqlalchemy import func, literal_column, table, column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models import Question, Test
+
+# Maintained by migration 0004; not mapped on the model since it is dialect specific
+_search_vector = literal_column("questions.search_vector")
+_questions_fts = table("questions_fts", column("rowid"))
+
+
+def _fts5_query(text: str) -> str:
+    # Quote every term so user input can't be parsed as FTS5 operators
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+def _ranked_query(dialect: str, text: str):
+    if dialect == "postgresql":
+        query = func.websearch_to_tsquery("english", text)
+        rank = func.ts_rank(_search_vector, query)
+        stmt = select(Question, Test.subject_id, rank.label("rank")).where(_search_vector.op("@@")(query))
+        return stmt, rank.desc()
+    if dialect == "sqlite":
+        # bm25() is lower for better matches, so negate it to keep "higher is better"
+        rank = -func.bm25(literal_column("questions_fts"))
+        stmt = (
+            select(Question, Test.subject_id, rank.label("rank"))
+            .join(_questions_fts, _questions_fts.c.rowid == Question.id)
+            .where(literal_column("questions_fts").op("MATCH")(_fts5_query(text)))
+        )
+        return stmt, rank.desc()
+    raise NotImplementedError(f"Question search is not supported on {dialect}")
+
+
+async def search_questions(
+    db: AsyncSession,
+    text: str,
+    subject_id: Optional[int] = None,
+    question_type: Optional[str] = None,
+    min_marks: Optional[int] = None,
+    max_marks: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+):
+    """Rank questions matching `text`, returning (question, subject_id, rank) rows and has_more."""
+    if not text.strip():
+        return [], False
+    stmt, order = _ranked_query(db.bind.dialect.name, text)
+    stmt = stmt.join(Test, Test.id == Question.test_id)
+    if subject_id is not None:
+        stmt = stmt.where(Test.subject_id == subject_id)
+    if question_type is not None:
+        stmt = stmt.where(Question.question_type == question_type)
+    if min_marks is not None:
+        stmt = stmt.where(Question.marks >= min_marks)
+    if max_marks is not None:
+        stmt = stmt.where(Question.marks <= max_marks)
+
+    # Fetch one extra row instead of counting every match
+    result = await db.execute(stmt.order_by(order, Question.id).limit(limit + 1).offset(offset))
+    rows = result.all()
+    return rows[:limit], len(rows) > limit
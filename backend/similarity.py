@@ -0,0 +1,151 @@
+import hashlib
+import random
+import re
+from typing import Iterable, List, Optional, Sequence
+
+# MinHash signature length and LSH banding (BANDS * ROWS == NUM_PERM).
+# With 32 bands of 4 rows, pairs above ~0.6 Jaccard almost always share a bucket.
+NUM_PERM = 128
+BANDS = 32
+ROWS = 4
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures are persisted, so the permutations must never change
+_rng = random.Random(1729)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+HASH_COMMENT_LANGUAGES = {"python", "ruby", "bash"}
+
+KEYWORDS = {
+    "python": {
+        "and", "as", "assert", "async", "await", "break", "class", "continue", "def", "del",
+        "elif", "else", "except", "finally", "for", "from", "global", "if", "import", "in",
+        "is", "lambda", "nonlocal", "not", "or", "pass", "raise", "return", "try", "while",
+        "with", "yield", "None", "True", "False",
+    },
+    "javascript": {
+        "break", "case", "catch", "class", "const", "continue", "default", "delete", "do",
+        "else", "export", "extends", "finally", "for", "function", "if", "import", "in",
+        "instanceof", "let", "new", "return", "switch", "this", "throw", "try", "typeof",
+        "var", "void", "while", "yield", "async", "await", "null", "undefined", "true", "false",
+    },
+    "java": {
+        "abstract", "boolean", "break", "byte", "case", "catch", "char", "class", "continue",
+        "default", "do", "double", "else", "extends", "final", "finally", "float", "for", "if",
+        "implements", "import", "instanceof", "int", "interface", "long", "new", "package",
+        "private", "protected", "public", "return", "short", "static", "super", "switch",
+        "this", "throw", "throws", "try", "void", "while", "null", "true", "false",
+    },
+    "c": {
+        "auto", "break", "case", "char", "const", "continue", "default", "do", "double", "else",
+        "enum", "extern", "float", "for", "goto", "if", "int", "long", "register", "return",
+        "short", "signed", "sizeof", "static", "struct", "switch", "typedef", "union",
+        "unsigned", "void", "volatile", "while",
+    },
+    "go": {
+        "break", "case", "chan", "const", "continue", "default", "defer", "else", "fallthrough",
+        "for", "func", "go", "goto", "if", "import", "interface", "map", "package", "range",
+        "return", "select", "struct", "switch", "type", "var", "nil", "true", "false",
+    },
+    "ruby": {
+        "begin", "break", "case", "class", "def", "do", "else", "elsif", "end", "ensure",
+        "false", "for", "if", "in", "module", "next", "nil", "not", "or", "and", "redo",
+        "rescue", "retry", "return", "self", "super", "then", "true", "unless", "until",
+        "when", "while", "yield",
+    },
+    "bash": {
+        "case", "do", "done", "elif", "else", "esac", "fi", "for", "function", "if", "in",
+        "select", "then", "until", "while", "local", "return", "echo",
+    },
+}
+KEYWORDS["cpp"] = KEYWORDS["c"] | {
+    "bool", "catch", "class", "delete", "false", "namespace", "new", "nullptr", "operator",
+    "private", "protected", "public", "template", "this", "throw", "true", "try", "using",
+    "virtual",
+}
+
+_TOKEN_BODY = (
+    r'|(?P<str>"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`[^`]*`)'
+    r"|(?P<num>\d+(?:\.\d+)?)"
+    r"|(?P<id>[A-Za-z_]\w*)"
+    r"|(?P<op>\S)"
+)
+# Comments and strings sit in one alternation, so whichever starts first wins:
+# a quote inside a comment or a comment marker inside a string is left alone.
+_HASH_TOKEN = re.compile(r"(?P<comment>#[^\n]*)" + _TOKEN_BODY)
+_C_TOKEN = re.compile(r"(?P<comment>//[^\n]*|/\*.*?\*/)" + _TOKEN_BODY, re.S)
+
+
+def normalize(code: str, language: Optional[str]) -> List[str]:
+    """Tokenize code with comments removed, literals collapsed and identifiers renamed.
+
+    Keywords and operators are kept, so structure survives renaming and reformatting.
+    """
+    language = (language or "python").lower()
+    token_re = _HASH_TOKEN if language in HASH_COMMENT_LANGUAGES else _C_TOKEN
+
+    keywords = KEYWORDS.get(language, set())
+    tokens = []
+    for match in token_re.finditer(code):
+        kind = match.lastgroup
+        text = match.group(0)
+        if kind == "comment":
+            continue
+        if kind == "str":
+            tokens.append("S")
+        elif kind == "num":
+            tokens.append("N")
+        elif kind == "id":
+            tokens.append(text if text in keywords else "V")
+        else:
+            tokens.append(text)
+    return tokens
+
+
+def _hash64(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def shingles(tokens: Sequence[str], size: int = SHINGLE_SIZE) -> set:
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash(shingle_set: Iterable[str]) -> List[int]:
+    signature = [_MAX_HASH] * NUM_PERM
+    for shingle in shingle_set:
+        h = _hash64(shingle)
+        for i, (a, b) in enumerate(_PERMUTATIONS):
+            value = ((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH
+            if value < signature[i]:
+                signature[i] = value
+    return signature
+
+
+def signature_for(code: str, language: Optional[str]) -> Optional[List[int]]:
+    """MinHash signature for a coding answer, or None if it has no tokens."""
+    shingle_set = shingles(normalize(code, language))
+    if not shingle_set:
+        return None
+    return minhash(shingle_set)
+
+
+def band_hashes(signature: Sequence[int]) -> List[int]:
+    """One bucket key per LSH band, as signed 64-bit ints for a BigInteger column."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def estimate_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
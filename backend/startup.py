@@ -0,0 +1,66 @@
+import os
+from contextlib import AsyncExitStack
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.future import select
+
+from database import engine, DB_POOL_SIZE, USES_QUEUE_POOL
+from models import Test
+from queries import active_test_query, test_questions_query
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true"
+# Tests preloaded during warm-up (Test has no start time, so the most recent active ones)
+WARMUP_TEST_LIMIT = int(os.getenv("WARMUP_TEST_LIMIT", "20"))
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def _head_revisions():
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def _current_revisions(sync_conn):
+    return set(MigrationContext.configure(sync_conn).get_current_heads())
+
+
+async def check_schema_version():
+    """Fail fast if the database is not at the Alembic head revision."""
+    async with engine.connect() as conn:
+        current = await conn.run_sync(_current_revisions)
+    head = _head_revisions()
+    if current != head:
+        raise SchemaOutOfDate(
+            f"Database schema is at {sorted(current) or 'no revision'}, expected {sorted(head)}. "
+            "Run 'alembic upgrade head'."
+        )
+
+
+async def warm_up():
+    """Fill the connection pool and prime each connection with the hot queries."""
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(Test.id)
+            .where(Test.is_active == True)
+            .order_by(Test.created_at.desc())
+            .limit(WARMUP_TEST_LIMIT)
+        )
+        test_ids = list(result.scalars().all())
+
+    # Hold every connection at once so the pool actually opens DB_POOL_SIZE of them;
+    # running the route statements on each one fills its prepared-statement cache.
+    # SQLite engines have no queue pool to fill, so one connection is enough there.
+    connections = DB_POOL_SIZE if USES_QUEUE_POOL else 1
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(engine.connect())
+            for test_id in test_ids:
+                await conn.execute(active_test_query(test_id))
+                await conn.execute(test_questions_query(test_id))
@@ -111,10 +111,18 @@ const TakeTest = () => {
     try {
       const data = {
         test_id: parseInt(testId),
-        answers: test.questions.map((q) => ({
-          question_id: q.id,
-          answer: answers[q.id] || "",
-        })),
+        answers: test.questions.map((q) => {
+          if (q.question_type === "coding") {
+            // Code lives in the per-question file system; submit the entrypoint file
+            const fs = fileSystems[q.id];
+            return {
+              question_id: q.id,
+              answer: fs?.files?.[fs.activeFile] || "",
+              language: fs?.language || answers[q.id + "_language"],
+            };
+          }
+          return { question_id: q.id, answer: answers[q.id] || "" };
+        }),
         time_taken_minutes: test.duration_minutes - Math.ceil(timeLeft / 60),
       };
 
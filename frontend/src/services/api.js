@@ -45,6 +45,7 @@ export const testAPI = {
   getTestsBySubject: (subjectId) => api.get(`/api/subjects/${subjectId}/tests`),
   getTest: (testId) => api.get(`/api/tests/${testId}`),
   createTest: (testData) => api.post("/api/tests/", testData),
+  searchQuestions: (params) => api.get("/api/questions/search", { params }),
 
   uploadTestPDF: async (testId, file) => {
     try {
@@ -76,6 +77,12 @@ export const testAPI = {
     api.post(`/api/tests/${testId}/submit`, submissionData),
 
   getMySubmissions: () => api.get("/api/my-submissions/"),
+
+  exportSubmissions: (testId, format = "csv") =>
+    api.get(`/api/tests/${testId}/export`, {
+      params: { format },
+      responseType: "blob",
+    }),
 };
 
 // your FastAPI base URL